@@ -1,14 +1,20 @@
+from collections import deque
+
 import aws_cdk as cdk
 from aws_cdk import Tags
+from constructs import IConstruct
 
 from cdk.root_stack import OtakaraKujiStack
 
 
-def add_name_tag(scope):  # noqa: ANN001, ANN201
-    for child in scope.node.children:
-        if cdk.Resource.is_resource(child):
+def add_name_tag(scope: IConstruct) -> None:
+    is_resource = cdk.Resource.is_resource
+    queue = deque(scope.node.children)
+    while queue:
+        child = queue.popleft()
+        if is_resource(child):
             Tags.of(child).add("Name", child.node.path.replace("/", "-"))
-        add_name_tag(child)
+        queue.extend(child.node.children)
 
 
 app = cdk.App()
@@ -1,6 +1,7 @@
 from typing import Any, TypeVar
 
 from aws_cdk import aws_apigateway as apigw
+from aws_cdk import aws_lambda as lambda_
 from constructs import Construct
 
 from cdk.infra_construct import InfraConstruct
@@ -27,15 +28,29 @@ class AppConstruct(Construct):
                 allow_methods=apigw.Cors.ALL_METHODS,
             ),
         )
+
+        self.lib_layer = lambda_.LayerVersion(
+            scope=self,
+            id="lib",
+            code=lambda_.Code.from_asset(".layers"),
+            compatible_runtimes=[lambda_.Runtime.PYTHON_3_10],
+            compatible_architectures=[lambda_.Architecture.ARM_64],
+        )
+
         category = self.api.root.add_resource("category")
         omikuji = self.api.root.add_resource("omikuji")
         omikuji_category = omikuji.add_resource("{category}")
 
-        self.create_category = LambdaConstruct(self, "create_category", infra)
+        self.create_category = LambdaConstruct(
+            self,
+            "create_category",
+            infra,
+            self.lib_layer,
+        )
         category.add_method(
             http_method="POST",
             integration=apigw.LambdaIntegration(
-                handler=self.create_category.function,
+                handler=self.create_category.handler,
             ),
         )
         assert self.create_category.function.role is not None
@@ -50,11 +65,16 @@ class AppConstruct(Construct):
             value=infra.table_item.table_name,
         )
 
-        self.list_category = LambdaConstruct(self, "list_category", infra)
+        self.list_category = LambdaConstruct(
+            self,
+            "list_category",
+            infra,
+            self.lib_layer,
+        )
         category.add_method(
             http_method="GET",
             integration=apigw.LambdaIntegration(
-                handler=self.list_category.function,
+                handler=self.list_category.handler,
             ),
         )
         assert self.list_category.function.role is not None
@@ -63,12 +83,21 @@ class AppConstruct(Construct):
             key="CATEGORY_TABLE_NAME",
             value=infra.table_category.table_name,
         )
+        self.list_category.function.add_environment(
+            key="CATEGORY_INDEX_NAME",
+            value=infra.category_index_name,
+        )
 
-        self.delete_category = LambdaConstruct(self, "delete_category", infra)
+        self.delete_category = LambdaConstruct(
+            self,
+            "delete_category",
+            infra,
+            self.lib_layer,
+        )
         category.add_method(
             http_method="DELETE",
             integration=apigw.LambdaIntegration(
-                handler=self.delete_category.function,
+                handler=self.delete_category.handler,
             ),
         )
         assert self.delete_category.function.role is not None
@@ -83,11 +112,16 @@ class AppConstruct(Construct):
             value=infra.table_item.table_name,
         )
 
-        self.omikuji = LambdaConstruct(self, "omikuji", infra)
+        self.omikuji = LambdaConstruct(
+            self,
+            "omikuji",
+            infra,
+            self.lib_layer,
+        )
         omikuji_category.add_method(
             http_method="GET",
             integration=apigw.LambdaIntegration(
-                handler=self.omikuji.function,
+                handler=self.omikuji.handler,
             ),
         )
         assert self.omikuji.function.role is not None
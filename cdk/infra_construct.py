@@ -28,6 +28,25 @@ class InfraConstruct(Construct):
             billing_mode=dynamdb.BillingMode.PAY_PER_REQUEST,
             removal_policy=cdk.RemovalPolicy.DESTROY,
         )
+        self.category_index_name = "list_category"
+        self.table_category.add_global_secondary_index(
+            index_name=self.category_index_name,
+            partition_key=dynamdb.Attribute(
+                name="gsi_pk",
+                type=dynamdb.AttributeType.STRING,
+            ),
+            sort_key=dynamdb.Attribute(
+                name="category",
+                type=dynamdb.AttributeType.STRING,
+            ),
+            projection_type=dynamdb.ProjectionType.KEYS_ONLY,
+        )
+        cdk.CfnOutput(
+            self,
+            "category_table_name",
+            value=self.table_category.table_name,
+            export_name="OtakaraKuji-category-table-name",
+        )
 
         self.table_item = dynamdb.Table(
             scope=self,
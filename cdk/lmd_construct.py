@@ -1,9 +1,11 @@
 from pathlib import Path
-from typing import Any, TypeVar
+from typing import Any, TypeVar, cast
 
 import aws_cdk as cdk
 from aws_cdk import aws_cloudwatch as cloudwatch
 from aws_cdk import aws_cloudwatch_actions as cloudwatch_actions
+from aws_cdk import aws_events as events
+from aws_cdk import aws_events_targets as targets
 from aws_cdk import aws_lambda as lambda_
 from aws_cdk import aws_logs as logs
 from constructs import Construct
@@ -20,24 +22,11 @@ class LambdaConstruct(Construct):
         scope: Construct,
         construct_id: str,
         infra: InfraConstruct,
+        lib_layer: lambda_.ILayerVersion,
         **kwargs: Any,  # noqa: ANN401
     ) -> None:
         super().__init__(scope, construct_id, **kwargs)
 
-        region = cdk.Stack.of(self).region
-        powertools_layer = lambda_.LayerVersion.from_layer_version_arn(
-            self,
-            "powertools",
-            layer_version_arn=f"arn:aws:lambda:{region}:017000801446:layer:AWSLambdaPowertoolsPythonV2:40",
-        )
-
-        lib_layer = lambda_.LayerVersion(
-            self,
-            "lib",
-            code=lambda_.Code.from_asset(".layers"),
-            compatible_runtimes=[lambda_.Runtime.PYTHON_3_10],
-        )
-
         self.function = lambda_.Function(
             scope=self,
             id="function",
@@ -46,16 +35,50 @@ class LambdaConstruct(Construct):
             ),
             handler="lambda_function.lambda_handler",
             runtime=lambda_.Runtime.PYTHON_3_10,
+            architecture=lambda_.Architecture.ARM_64,
             environment=paramater["lambda"][construct_id]["env"],  # type: ignore  # noqa: PGH003, E501
             memory_size=paramater["lambda"][construct_id]["memory_size"],  # type: ignore  # noqa: PGH003, E501
-            layers=[powertools_layer, lib_layer],
+            ephemeral_storage_size=cdk.Size.mebibytes(
+                cast(int, paramater["lambda"][construct_id]["ephemeral_storage_size"]),
+            ),
+            layers=[lib_layer],
         )
 
         self.function.add_environment(
-            "POWERTOOLS_SERVICE_NAME",
+            "SERVICE_NAME",
             construct_id,
         )
 
+        self.alias: lambda_.Alias | None = None
+        provisioned_concurrency = paramater["lambda"][construct_id].get(
+            "provisioned_concurrency",
+        )
+        if provisioned_concurrency is not None:
+            self.alias = lambda_.Alias(
+                scope=self,
+                id="live",
+                alias_name="live",
+                version=self.function.current_version,
+                provisioned_concurrent_executions=cast(int, provisioned_concurrency),
+            )
+
+        self.handler: lambda_.IFunction = self.alias or self.function
+
+        # provisioned concurrency already keeps the alias warm
+        self.warmer_rule: events.Rule | None = None
+        if self.alias is None:
+            self.warmer_rule = events.Rule(
+                scope=self,
+                id="warmer",
+                schedule=events.Schedule.rate(cdk.Duration.minutes(5)),
+                targets=[
+                    targets.LambdaFunction(
+                        self.function,
+                        event=events.RuleTargetInput.from_object({"warmer": True}),
+                    ),
+                ],
+            )
+
         self.lambda_error_metric = self.function.metric_all_errors(
             period=cdk.Duration.minutes(5),
         )
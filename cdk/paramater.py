@@ -5,24 +5,29 @@ paramater = {
                 "LOG_LEVEL": "INFO",
             },
             "memory_size": 128,
+            "ephemeral_storage_size": 512,
         },
         "list_category": {
             "env": {
                 "LOG_LEVEL": "INFO",
             },
             "memory_size": 128,
+            "ephemeral_storage_size": 512,
         },
         "delete_category": {
             "env": {
                 "LOG_LEVEL": "INFO",
             },
             "memory_size": 128,
+            "ephemeral_storage_size": 512,
         },
         "omikuji": {
             "env": {
                 "LOG_LEVEL": "INFO",
             },
             "memory_size": 128,
+            "ephemeral_storage_size": 512,
+            "provisioned_concurrency": 1,
         },
     },
 }
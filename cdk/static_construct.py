@@ -4,7 +4,6 @@ import aws_cdk as cdk
 from aws_cdk import aws_cloudfront as cloudfront
 from aws_cdk import aws_cloudfront_origins as origins
 from aws_cdk import aws_s3 as s3
-from aws_cdk import aws_s3_deployment as deployment
 from constructs import Construct
 
 Self = TypeVar("Self", bound="StaticConstruct")
@@ -34,18 +33,21 @@ class StaticConstruct(Construct):
             ),
         )
 
-        deployment.BucketDeployment(
-            self,
-            "deploy",
-            sources=[deployment.Source.asset("src/static")],
-            destination_bucket=static_bucket,
-            distribution=static_distribution,
-            distribution_paths=["/*"],
-        )
-
         # output
         cdk.CfnOutput(
             self,
             "static_web_url",
             value=f"https://{static_distribution.domain_name}",
         )
+        cdk.CfnOutput(
+            self,
+            "static_bucket_name",
+            value=static_bucket.bucket_name,
+            export_name="OtakaraKuji-static-bucket-name",
+        )
+        cdk.CfnOutput(
+            self,
+            "static_distribution_id",
+            value=static_distribution.distribution_id,
+            export_name="OtakaraKuji-static-distribution-id",
+        )
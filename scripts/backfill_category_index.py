@@ -0,0 +1,35 @@
+import sys
+
+import boto3
+import botocore
+
+CATEGORY_INDEX_PARTITION = "ALL"
+
+
+def backfill_category_index(table_name: str) -> None:
+    client = boto3.client("dynamodb")
+    paginator = client.get_paginator("scan")
+    response_iterator = paginator.paginate(
+        TableName=table_name,
+        ProjectionExpression="category",
+        FilterExpression="attribute_not_exists(gsi_pk)",
+    )
+    for category in response_iterator.search("Items[].category"):
+        try:
+            client.update_item(
+                TableName=table_name,
+                Key={"category": category},
+                UpdateExpression="SET gsi_pk = :gsi_pk",
+                ConditionExpression="attribute_exists(category)",
+                ExpressionAttributeValues={
+                    ":gsi_pk": {"S": CATEGORY_INDEX_PARTITION},
+                },
+            )
+        except botocore.exceptions.ClientError as error:
+            # deleted between the scan and the update
+            if error.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+
+
+if __name__ == "__main__":
+    backfill_category_index(sys.argv[1])
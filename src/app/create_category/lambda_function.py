@@ -1,21 +1,75 @@
 import json
+import logging
 import os
+import random
+import time
 import traceback
+from collections.abc import Iterable, Iterator
+from itertools import islice
 from typing import Any, NamedTuple, TypeVar
 
 import boto3
 import botocore
-from aws_lambda_powertools.logging import Logger
-from aws_lambda_powertools.utilities.typing import LambdaContext
+import orjson
 from mypy_boto3_dynamodb import DynamoDBClient, DynamoDBServiceResource
 
-logger = Logger()
+JsonFormatterSelf = TypeVar("JsonFormatterSelf", bound="JsonFormatter")
+CorrelationIdFilterSelf = TypeVar(
+    "CorrelationIdFilterSelf",
+    bound="CorrelationIdFilter",
+)
+
+
+class JsonFormatter(logging.Formatter):
+    def format(  # noqa: A003
+        self: JsonFormatterSelf,
+        record: logging.LogRecord,
+    ) -> str:
+        log = {
+            "level": record.levelname,
+            "location": f"{record.funcName}:{record.lineno}",
+            "message": record.getMessage(),
+            "timestamp": self.formatTime(record),
+            "service": os.environ.get("SERVICE_NAME"),
+            "correlation_id": getattr(record, "correlation_id", None),
+        }
+        if record.exc_info:
+            log["exception"] = self.formatException(record.exc_info)
+        return json.dumps(log, default=str)
+
+
+class CorrelationIdFilter(logging.Filter):
+    correlation_id: str | None = None
+
+    def filter(  # noqa: A003
+        self: CorrelationIdFilterSelf,
+        record: logging.LogRecord,
+    ) -> bool:
+        record.correlation_id = self.correlation_id
+        return True
+
+
+logger = logging.getLogger()
+logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
+correlation_id_filter = CorrelationIdFilter()
+for handler in logger.handlers:
+    handler.setFormatter(JsonFormatter())
+    handler.addFilter(correlation_id_filter)
+
 dynamodb_client = boto3.client("dynamodb")
 dynamodb_resource = boto3.resource("dynamodb")
 ClientErrorSelf = TypeVar("ClientErrorSelf", bound="ClientError")
 ServerErrorSelf = TypeVar("ServerErrorSelf", bound="ServerError")
+UnprocessedItemsErrorSelf = TypeVar(
+    "UnprocessedItemsErrorSelf",
+    bound="UnprocessedItemsError",
+)
 ResponseSelf = TypeVar("ResponseSelf", bound="Response")
 ApiBodySelf = TypeVar("ApiBodySelf", bound="ApiBody")
+CATEGORY_INDEX_PARTITION = "ALL"
+BATCH_WRITE_MAX_ITEMS = 25
+BATCH_WRITE_MAX_RETRIES = 5
+BATCH_WRITE_BACKOFF_SECONDS = 0.05
 
 
 class ClientError(Exception):
@@ -29,6 +83,19 @@ class ServerError(Exception):
         super().__init__(f"{message}: {input_param}")
 
 
+class UnprocessedItemsError(ServerError):
+    def __init__(
+        self: UnprocessedItemsErrorSelf,
+        table_name: str,
+        unprocessed_items: list[dict],
+    ) -> None:
+        self.unprocessed_items = unprocessed_items
+        super().__init__(
+            json.dumps(unprocessed_items),
+            f"Items were left unprocessed in {table_name}",
+        )
+
+
 class EnvParam(NamedTuple):
     CATEGORY_TABLE_NAME: str
     ITEM_TABLE_NAME: str
@@ -36,7 +103,10 @@ class EnvParam(NamedTuple):
     @classmethod
     def from_env(cls: type["EnvParam"]) -> "EnvParam":
         try:
-            return EnvParam(**{k: os.environ[k] for k in EnvParam._fields})
+            return EnvParam(
+                os.environ["CATEGORY_TABLE_NAME"],
+                os.environ["ITEM_TABLE_NAME"],
+            )
         except Exception as e:
             raise ServerError(
                 json.dumps(os.environ),
@@ -44,6 +114,30 @@ class EnvParam(NamedTuple):
             ) from e
 
 
+try:
+    _ENV: EnvParam | None = EnvParam.from_env()
+except ServerError:
+    _ENV = None
+
+
+def contains_float(obj: Any) -> bool:  # noqa: ANN401
+    if isinstance(obj, float):
+        return True
+    if isinstance(obj, dict):
+        return any(contains_float(v) for v in obj.values())
+    if isinstance(obj, list):
+        return any(contains_float(v) for v in obj)
+    return False
+
+
+def loads_body(body: str) -> Any:  # noqa: ANN401
+    data = orjson.loads(body)
+    # orjson reads integers beyond 64 bits as floats, json keeps them as int
+    if contains_float(data):
+        return json.loads(body)
+    return data
+
+
 class ApiBody(NamedTuple):
     category: str
     items: list[dict]
@@ -51,8 +145,8 @@ class ApiBody(NamedTuple):
     @classmethod
     def from_event(cls: type["ApiBody"], event: dict[str, Any]) -> "ApiBody":
         try:
-            body = json.loads(event["body"])
-            return ApiBody(**{k: body[k] for k in ApiBody._fields})
+            body = loads_body(event["body"])
+            return ApiBody(body["category"], body["items"])
         except Exception as e:
             raise ClientError(event["body"], "Invalid parameter.") from e
 
@@ -88,38 +182,55 @@ def put_items(
             ) from error
 
 
+def batch_write(
+    client: DynamoDBClient,
+    table_name: str,
+    requests: list[dict],
+) -> None:
+    request_items = {table_name: requests}
+    for attempt in range(BATCH_WRITE_MAX_RETRIES + 1):
+        if attempt > 0:
+            time.sleep(BATCH_WRITE_BACKOFF_SECONDS * 2**attempt * random.random())
+        response = client.batch_write_item(RequestItems=request_items)
+        request_items = response.get("UnprocessedItems", {})
+        if not request_items:
+            return
+    raise UnprocessedItemsError(table_name, request_items[table_name])
+
+
 def delete_items(
-    db_resource: DynamoDBServiceResource,
+    client: DynamoDBClient,
     table_name: str,
-    keys: list[dict],
+    keys: Iterable[dict],
 ) -> None:
-    if len(keys) == 0:
-        return
-    table = db_resource.Table(table_name)
+    iterator = iter(keys)
     try:
-        with table.batch_writer() as batch:
-            for key in keys:
-                batch.delete_item(Key=key)
+        while chunk := list(islice(iterator, BATCH_WRITE_MAX_ITEMS)):
+            batch_write(
+                client=client,
+                table_name=table_name,
+                requests=[{"DeleteRequest": {"Key": key}} for key in chunk],
+            )
     except botocore.exceptions.ClientError as error:
         if error.response["Error"]["Code"] == "InternalServerError":
             raise ServerError(
-                json.dumps(key),
+                table_name,
                 error.response["Error"]["Message"],
             ) from error
         else:
             raise ClientError(
-                json.dumps(key),
+                table_name,
                 error.response["Error"]["Message"],
             ) from error
 
 
-def scan_items(client: DynamoDBClient, db_name: str, query: str) -> list[str]:
+def scan_items(client: DynamoDBClient, db_name: str, query: str) -> Iterator[str]:
     paginator = client.get_paginator("scan")
     response_iterator = paginator.paginate(
         TableName=db_name,
     )
     try:
-        return list(response_iterator.search(query))
+        yield from response_iterator.search(query)
     except botocore.exceptions.ClientError as error:
         if error.response["Error"]["Code"] == "InternalServerError":
             raise ServerError(
@@ -127,7 +238,7 @@ def scan_items(client: DynamoDBClient, db_name: str, query: str) -> list[str]:
                 error.response["Error"]["Message"],
             ) from error
         elif error.response["Error"]["Code"] == "ResourceNotFoundException":
-            return []
+            return
         else:
             raise ClientError(
                 query,
@@ -141,7 +252,7 @@ def query_items(
     key: str,
     value: str,
     query: str,
-) -> list[str]:
+) -> Iterator[Any]:
     paginator = client.get_paginator("query")
     response_iterator = paginator.paginate(
         TableName=db_name,
@@ -150,7 +261,7 @@ def query_items(
         },
     )
     try:
-        return list(response_iterator.search(query))
+        yield from response_iterator.search(query)
     except botocore.exceptions.ClientError as error:
         if error.response["Error"]["Code"] == "InternalServerError":
             raise ServerError(
@@ -158,7 +269,7 @@ def query_items(
                 error.response["Error"]["Message"],
             ) from error
         elif error.response["Error"]["Code"] == "ResourceNotFoundException":
-            return []
+            return
         else:
             raise ClientError(
                 query,
@@ -189,6 +300,15 @@ def get_item(
             ) from error
 
 
+def prime_connection(client: DynamoDBClient, table_name: str | None) -> None:
+    if table_name is None:
+        return
+    try:
+        client.describe_table(TableName=table_name)
+    except Exception:
+        logger.warning(traceback.format_exc())
+
+
 class Response(NamedTuple):
     status_code: int
     message: str
@@ -203,11 +323,11 @@ class Response(NamedTuple):
                 "Access-Control-Allow-Credentials": True,
                 "Access-Control-Allow-Headers": "origin, x-requested-with",
             },
-            "body": json.dumps(
+            "body": orjson.dumps(
                 {
                     "message": self.message,
                 },
-            ),
+            ).decode(),
             "isBase64Encoded": False,
         }
 
@@ -233,12 +353,14 @@ def service(
         db_name=env.ITEM_TABLE_NAME,
         key="category",
         value=body.category,
-        query="Items[].item_id.S",
+        query="Items[].item_id",
     )
     delete_items(
-        db_resource=db_resource,
+        client=db_client,
         table_name=env.ITEM_TABLE_NAME,
-        keys=[{"category": body.category, "item_id": x} for x in response_items],
+        keys=(
+            {"category": {"S": body.category}, "item_id": x} for x in response_items
+        ),
     )
     put_items(
         db_resource=db_resource,
@@ -248,7 +370,13 @@ def service(
     put_items(
         db_resource=db_resource,
         table_name=env.CATEGORY_TABLE_NAME,
-        items=[{"category": body.category, "num_item": len(body.items)}],
+        items=[
+            {
+                "category": body.category,
+                "num_item": len(body.items),
+                "gsi_pk": CATEGORY_INDEX_PARTITION,
+            },
+        ],
     )
     return Response(
         status_code=200,
@@ -256,16 +384,29 @@ def service(
     )
 
 
-@logger.inject_lambda_context(
-    correlation_id_path="requestContext.requestId",
-)
-def lambda_handler(event: dict[str, Any], context: LambdaContext) -> dict[str, Any]:
+def is_warmup_event(event: dict[str, Any]) -> bool:
+    return (
+        event.get("source") == "serverless-plugin-warmup"
+        or event.get("warmer") is True
+    )
+
+
+def lambda_handler(
+    event: dict[str, Any],
+    context: Any,  # noqa: ANN401
+) -> dict[str, Any]:
+    correlation_id_filter.correlation_id = event.get("requestContext", {}).get(
+        "requestId",
+    )
+    if is_warmup_event(event):
+        logger.info("warmup")
+        return {"statusCode": 200, "body": "warm"}
     try:
         return service(
             body=ApiBody.from_event(event),
             db_client=dynamodb_client,
             db_resource=dynamodb_resource,
-            env=EnvParam.from_env(),
+            env=_ENV if _ENV is not None else EnvParam.from_env(),
         ).data()
     except ServerError:
         logger.error(traceback.format_exc())
@@ -274,7 +415,7 @@ def lambda_handler(event: dict[str, Any], context: LambdaContext) -> dict[str, A
             message="internal server error. Please access again after some time.",
         ).data()
     except ClientError as ce:
-        logger.warning(traceback.format_exc())
+        logger.warning("client error. %s", ce)
         return Response(
             status_code=400,
             message=f"client error. {ce.message}",
@@ -285,3 +426,7 @@ def lambda_handler(event: dict[str, Any], context: LambdaContext) -> dict[str, A
             status_code=500,
             message="internal server error. Please contact the operator.",
         ).data()
+
+
+prime_connection(dynamodb_client, os.environ.get("CATEGORY_TABLE_NAME"))
+prime_connection(dynamodb_resource.meta.client, os.environ.get("CATEGORY_TABLE_NAME"))
@@ -1,20 +1,87 @@
 import json
+import logging
 import os
+import random
+import time
 import traceback
+from collections.abc import Iterator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
 from typing import Any, NamedTuple, TypeVar
 
 import boto3
 import botocore
-from aws_lambda_powertools.logging import Logger
-from aws_lambda_powertools.utilities.typing import LambdaContext
-from mypy_boto3_dynamodb import DynamoDBClient, DynamoDBServiceResource
+import orjson
+from botocore.config import Config
+from mypy_boto3_dynamodb import DynamoDBClient
+
+JsonFormatterSelf = TypeVar("JsonFormatterSelf", bound="JsonFormatter")
+CorrelationIdFilterSelf = TypeVar(
+    "CorrelationIdFilterSelf",
+    bound="CorrelationIdFilter",
+)
+
+
+class JsonFormatter(logging.Formatter):
+    def format(  # noqa: A003
+        self: JsonFormatterSelf,
+        record: logging.LogRecord,
+    ) -> str:
+        log = {
+            "level": record.levelname,
+            "location": f"{record.funcName}:{record.lineno}",
+            "message": record.getMessage(),
+            "timestamp": self.formatTime(record),
+            "service": os.environ.get("SERVICE_NAME"),
+            "correlation_id": getattr(record, "correlation_id", None),
+        }
+        if record.exc_info:
+            log["exception"] = self.formatException(record.exc_info)
+        return json.dumps(log, default=str)
+
+
+class CorrelationIdFilter(logging.Filter):
+    correlation_id: str | None = None
+
+    def filter(  # noqa: A003
+        self: CorrelationIdFilterSelf,
+        record: logging.LogRecord,
+    ) -> bool:
+        record.correlation_id = self.correlation_id
+        return True
 
-logger = Logger()
-dynamodb_client = boto3.client("dynamodb")
-dynamodb_resource = boto3.resource("dynamodb")
+
+logger = logging.getLogger()
+logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
+correlation_id_filter = CorrelationIdFilter()
+for handler in logger.handlers:
+    handler.setFormatter(JsonFormatter())
+    handler.addFilter(correlation_id_filter)
+
+dynamodb_client = boto3.client(
+    "dynamodb",
+    config=Config(
+        tcp_keepalive=True,
+        max_pool_connections=10,
+        retries={"mode": "standard"},
+    ),
+)
 ClientErrorSelf = TypeVar("ClientErrorSelf", bound="ClientError")
 ServerErrorSelf = TypeVar("ServerErrorSelf", bound="ServerError")
+UnprocessedItemsErrorSelf = TypeVar(
+    "UnprocessedItemsErrorSelf",
+    bound="UnprocessedItemsError",
+)
 ResponseSelf = TypeVar("ResponseSelf", bound="Response")
+BATCH_WRITE_MAX_ITEMS = 25
+BATCH_WRITE_MAX_WORKERS = 8
+BATCH_WRITE_MAX_RETRIES = 5
+BATCH_WRITE_BACKOFF_SECONDS = 0.05
 
 
 class ClientError(Exception):
@@ -28,6 +95,19 @@ class ServerError(Exception):
         super().__init__(f"{message}: {input_param}")
 
 
+class UnprocessedItemsError(ServerError):
+    def __init__(
+        self: UnprocessedItemsErrorSelf,
+        table_name: str,
+        unprocessed_items: list[dict],
+    ) -> None:
+        self.unprocessed_items = unprocessed_items
+        super().__init__(
+            json.dumps(unprocessed_items),
+            f"Items were left unprocessed in {table_name}",
+        )
+
+
 class EnvParam(NamedTuple):
     CATEGORY_TABLE_NAME: str
     ITEM_TABLE_NAME: str
@@ -35,7 +115,10 @@ class EnvParam(NamedTuple):
     @classmethod
     def from_env(cls: type["EnvParam"]) -> "EnvParam":
         try:
-            return EnvParam(**{k: os.environ[k] for k in EnvParam._fields})
+            return EnvParam(
+                os.environ["CATEGORY_TABLE_NAME"],
+                os.environ["ITEM_TABLE_NAME"],
+            )
         except Exception as e:
             raise ServerError(
                 json.dumps(os.environ),
@@ -43,6 +126,12 @@ class EnvParam(NamedTuple):
             ) from e
 
 
+try:
+    _ENV: EnvParam | None = EnvParam.from_env()
+except ServerError:
+    _ENV = None
+
+
 class ApiBody(NamedTuple):
     category: str
     items: list[dict]
@@ -50,91 +139,133 @@ class ApiBody(NamedTuple):
     @classmethod
     def from_event(cls: type["ApiBody"], event: dict[str, Any]) -> "ApiBody":
         try:
-            body = json.loads(event["body"])
-            return ApiBody(**{k: body[k] for k in ApiBody._fields})
+            body = orjson.loads(event["body"])
+            return ApiBody(body["category"], body["items"])
         except Exception as e:
             raise ClientError(event["body"], "Invalid parameter.") from e
 
 
-def delete_items(
-    db_resource: DynamoDBServiceResource,
-    table_name: str,
-    keys: list[dict],
-) -> None:
-    if len(keys) == 0:
-        return
-    table = db_resource.Table(table_name)
-    try:
-        with table.batch_writer() as batch:
-            for key in keys:
-                batch.delete_item(Key=key)
-    except botocore.exceptions.ClientError as error:
-        if error.response["Error"]["Code"] == "InternalServerError":
-            raise ServerError(
-                json.dumps(key),
-                error.response["Error"]["Message"],
-            ) from error
-        else:
-            raise ClientError(
-                json.dumps(key),
-                error.response["Error"]["Message"],
-            ) from error
-
-
-def query_items(
+def query_delete_requests(
     client: DynamoDBClient,
     db_name: str,
-    key: str,
-    value: str,
-    query: str,
-) -> list[str]:
+    category: str,
+) -> Iterator[list[dict]]:
     paginator = client.get_paginator("query")
     response_iterator = paginator.paginate(
         TableName=db_name,
-        KeyConditions={
-            key: {"ComparisonOperator": "EQ", "AttributeValueList": [{"S": value}]},
-        },
+        KeyConditionExpression="category = :category",
+        ExpressionAttributeValues={":category": {"S": category}},
+        ProjectionExpression="item_id",
     )
+    requests: list[dict] = []
+    for page in response_iterator:
+        for item in page["Items"]:
+            requests.append(
+                {
+                    "DeleteRequest": {
+                        "Key": {
+                            "category": {"S": category},
+                            "item_id": item["item_id"],
+                        },
+                    },
+                },
+            )
+            if len(requests) == BATCH_WRITE_MAX_ITEMS:
+                yield requests
+                requests = []
+    if requests:
+        yield requests
+
+
+def batch_write(
+    client: DynamoDBClient,
+    table_name: str,
+    requests: list[dict],
+) -> None:
+    request_items = {table_name: requests}
+    for attempt in range(BATCH_WRITE_MAX_RETRIES + 1):
+        if attempt > 0:
+            time.sleep(BATCH_WRITE_BACKOFF_SECONDS * 2**attempt * random.random())
+        response = client.batch_write_item(RequestItems=request_items)
+        request_items = response.get("UnprocessedItems", {})
+        if not request_items:
+            return
+    raise UnprocessedItemsError(table_name, request_items[table_name])
+
+
+def delete_category(
+    client: DynamoDBClient,
+    table_name: str,
+    category: str,
+) -> None:
     try:
-        return list(response_iterator.search(query))
+        client.delete_item(
+            TableName=table_name,
+            Key={"category": {"S": category}},
+            ConditionExpression="attribute_exists(category)",
+        )
     except botocore.exceptions.ClientError as error:
-        if error.response["Error"]["Code"] == "InternalServerError":
+        if error.response["Error"]["Code"] == "ConditionalCheckFailedException":
+            raise ClientError(
+                input_param=category,
+                message=f"category is empty: {category}",
+            ) from error
+        elif error.response["Error"]["Code"] == "InternalServerError":
             raise ServerError(
-                query,
+                category,
                 error.response["Error"]["Message"],
             ) from error
-        elif error.response["Error"]["Code"] == "ResourceNotFoundException":
-            return []
         else:
             raise ClientError(
-                query,
+                category,
                 error.response["Error"]["Message"],
             ) from error
 
 
-def get_item(
-    db_resource: DynamoDBServiceResource,
+def delete_query_items(
+    client: DynamoDBClient,
     table_name: str,
-    key: dict,
-) -> dict[str, Any] | None:
-    table = db_resource.Table(table_name)
+    category: str,
+) -> None:
     try:
-        return table.get_item(Key=key).get("Item")
+        with ThreadPoolExecutor(max_workers=BATCH_WRITE_MAX_WORKERS) as executor:
+            futures: set[Future] = set()
+            for requests in query_delete_requests(
+                client=client,
+                db_name=table_name,
+                category=category,
+            ):
+                if len(futures) >= BATCH_WRITE_MAX_WORKERS:
+                    done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+                futures.add(executor.submit(batch_write, client, table_name, requests))
+            for future in as_completed(futures):
+                future.result()
     except botocore.exceptions.ClientError as error:
         if error.response["Error"]["Code"] == "InternalServerError":
             raise ServerError(
-                json.dumps(key),
+                category,
                 error.response["Error"]["Message"],
             ) from error
         elif error.response["Error"]["Code"] == "ResourceNotFoundException":
-            return None
+            return
         else:
             raise ClientError(
-                json.dumps(key),
+                category,
                 error.response["Error"]["Message"],
             ) from error
 
 
+def prime_connection(client: DynamoDBClient, table_name: str | None) -> None:
+    if table_name is None:
+        return
+    try:
+        client.describe_table(TableName=table_name)
+    except Exception:
+        logger.warning(traceback.format_exc())
+
+
 class Response(NamedTuple):
     status_code: int
     message: str
@@ -149,11 +280,11 @@ class Response(NamedTuple):
                 "Access-Control-Allow-Credentials": True,
                 "Access-Control-Allow-Headers": "origin, x-requested-with",
             },
-            "body": json.dumps(
+            "body": orjson.dumps(
                 {
                     "message": self.message,
                 },
-            ),
+            ).decode(),
             "isBase64Encoded": False,
         }
 
@@ -161,35 +292,17 @@ class Response(NamedTuple):
 def service(
     body: ApiBody,
     db_client: DynamoDBClient,
-    db_resource: DynamoDBServiceResource,
     env: EnvParam,
 ) -> Response:
-    response_category = get_item(
-        db_resource=db_resource,
-        table_name=env.CATEGORY_TABLE_NAME,
-        key={"category": body.category},
-    )
-    if response_category is None:
-        raise ClientError(
-            input_param=body.category,
-            message=f"category is empty: {body.category}",
-        )
-    response_items = query_items(
+    delete_query_items(
         client=db_client,
-        db_name=env.ITEM_TABLE_NAME,
-        key="category",
-        value=body.category,
-        query="Items[].item_id.S",
-    )
-    delete_items(
-        db_resource=db_resource,
         table_name=env.ITEM_TABLE_NAME,
-        keys=[{"category": body.category, "item_id": x} for x in response_items],
+        category=body.category,
     )
-    delete_items(
-        db_resource=db_resource,
+    delete_category(
+        client=db_client,
         table_name=env.CATEGORY_TABLE_NAME,
-        keys=[{"category": body.category}],
+        category=body.category,
     )
     return Response(
         status_code=200,
@@ -197,16 +310,28 @@ def service(
     )
 
 
-@logger.inject_lambda_context(
-    correlation_id_path="requestContext.requestId",
-)
-def lambda_handler(event: dict[str, Any], context: LambdaContext) -> dict[str, Any]:
+def is_warmup_event(event: dict[str, Any]) -> bool:
+    return (
+        event.get("source") == "serverless-plugin-warmup"
+        or event.get("warmer") is True
+    )
+
+
+def lambda_handler(
+    event: dict[str, Any],
+    context: Any,  # noqa: ANN401
+) -> dict[str, Any]:
+    correlation_id_filter.correlation_id = event.get("requestContext", {}).get(
+        "requestId",
+    )
+    if is_warmup_event(event):
+        logger.info("warmup")
+        return {"statusCode": 200, "body": "warm"}
     try:
         return service(
             body=ApiBody.from_event(event),
             db_client=dynamodb_client,
-            db_resource=dynamodb_resource,
-            env=EnvParam.from_env(),
+            env=_ENV if _ENV is not None else EnvParam.from_env(),
         ).data()
     except ServerError:
         logger.error(traceback.format_exc())
@@ -215,7 +340,7 @@ def lambda_handler(event: dict[str, Any], context: LambdaContext) -> dict[str, A
             message="internal server error. Please access again after some time.",
         ).data()
     except ClientError as ce:
-        logger.warning(traceback.format_exc())
+        logger.warning("client error. %s", ce)
         return Response(
             status_code=400,
             message=f"client error. {ce.message}",
@@ -226,3 +351,6 @@ def lambda_handler(event: dict[str, Any], context: LambdaContext) -> dict[str, A
             status_code=500,
             message="internal server error. Please contact the operator.",
         ).data()
+
+
+prime_connection(dynamodb_client, os.environ.get("CATEGORY_TABLE_NAME"))
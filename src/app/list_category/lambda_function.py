@@ -1,19 +1,71 @@
 import json
+import logging
 import os
 import traceback
+from collections.abc import Iterator
 from typing import Any, NamedTuple, TypeVar
 
 import boto3
 import botocore
-from aws_lambda_powertools.logging import Logger
-from aws_lambda_powertools.utilities.typing import LambdaContext
+import orjson
+from botocore.config import Config
 from mypy_boto3_dynamodb import DynamoDBClient
 
-logger = Logger()
-dynamodb_client = boto3.client("dynamodb")
+JsonFormatterSelf = TypeVar("JsonFormatterSelf", bound="JsonFormatter")
+CorrelationIdFilterSelf = TypeVar(
+    "CorrelationIdFilterSelf",
+    bound="CorrelationIdFilter",
+)
+
+
+class JsonFormatter(logging.Formatter):
+    def format(  # noqa: A003
+        self: JsonFormatterSelf,
+        record: logging.LogRecord,
+    ) -> str:
+        log = {
+            "level": record.levelname,
+            "location": f"{record.funcName}:{record.lineno}",
+            "message": record.getMessage(),
+            "timestamp": self.formatTime(record),
+            "service": os.environ.get("SERVICE_NAME"),
+            "correlation_id": getattr(record, "correlation_id", None),
+        }
+        if record.exc_info:
+            log["exception"] = self.formatException(record.exc_info)
+        return json.dumps(log, default=str)
+
+
+class CorrelationIdFilter(logging.Filter):
+    correlation_id: str | None = None
+
+    def filter(  # noqa: A003
+        self: CorrelationIdFilterSelf,
+        record: logging.LogRecord,
+    ) -> bool:
+        record.correlation_id = self.correlation_id
+        return True
+
+
+logger = logging.getLogger()
+logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
+correlation_id_filter = CorrelationIdFilter()
+for handler in logger.handlers:
+    handler.setFormatter(JsonFormatter())
+    handler.addFilter(correlation_id_filter)
+
+dynamodb_client = boto3.client(
+    "dynamodb",
+    config=Config(
+        tcp_keepalive=True,
+        max_pool_connections=10,
+        retries={"mode": "standard"},
+    ),
+)
 ClientErrorSelf = TypeVar("ClientErrorSelf", bound="ClientError")
 ServerErrorSelf = TypeVar("ServerErrorSelf", bound="ServerError")
 ResponseSelf = TypeVar("ResponseSelf", bound="Response")
+CATEGORY_INDEX_PARTITION = "ALL"
 
 
 class ClientError(Exception):
@@ -29,11 +81,15 @@ class ServerError(Exception):
 
 class EnvParam(NamedTuple):
     CATEGORY_TABLE_NAME: str
+    CATEGORY_INDEX_NAME: str
 
     @classmethod
     def from_env(cls: type["EnvParam"]) -> "EnvParam":
         try:
-            return EnvParam(**{k: os.environ[k] for k in EnvParam._fields})
+            return EnvParam(
+                os.environ["CATEGORY_TABLE_NAME"],
+                os.environ["CATEGORY_INDEX_NAME"],
+            )
         except Exception as e:
             raise ServerError(
                 json.dumps(os.environ),
@@ -41,13 +97,31 @@ class EnvParam(NamedTuple):
             ) from e
 
 
-def scan_items(client: DynamoDBClient, db_name: str, query: str) -> list[str]:
-    paginator = client.get_paginator("scan")
+try:
+    _ENV: EnvParam | None = EnvParam.from_env()
+except ServerError:
+    _ENV = None
+
+
+def query_categories(
+    client: DynamoDBClient,
+    db_name: str,
+    index_name: str,
+) -> Iterator[str]:
+    query = "Items[].category.S"
+    paginator = client.get_paginator("query")
     response_iterator = paginator.paginate(
         TableName=db_name,
+        IndexName=index_name,
+        KeyConditions={
+            "gsi_pk": {
+                "ComparisonOperator": "EQ",
+                "AttributeValueList": [{"S": CATEGORY_INDEX_PARTITION}],
+            },
+        },
     )
     try:
-        return list(response_iterator.search(query))
+        yield from response_iterator.search(query)
     except botocore.exceptions.ClientError as error:
         if error.response["Error"]["Code"] == "InternalServerError":
             raise ServerError(
@@ -55,7 +129,7 @@ def scan_items(client: DynamoDBClient, db_name: str, query: str) -> list[str]:
                 error.response["Error"]["Message"],
             ) from error
         elif error.response["Error"]["Code"] == "ResourceNotFoundException":
-            return []
+            return
         else:
             raise ClientError(
                 query,
@@ -63,6 +137,15 @@ def scan_items(client: DynamoDBClient, db_name: str, query: str) -> list[str]:
             ) from error
 
 
+def prime_connection(client: DynamoDBClient, table_name: str | None) -> None:
+    if table_name is None:
+        return
+    try:
+        client.describe_table(TableName=table_name)
+    except Exception:
+        logger.warning(traceback.format_exc())
+
+
 class Response(NamedTuple):
     status_code: int
     message: str | list[str]
@@ -77,11 +160,11 @@ class Response(NamedTuple):
                 "Access-Control-Allow-Credentials": True,
                 "Access-Control-Allow-Headers": "origin, x-requested-with",
             },
-            "body": json.dumps(
+            "body": orjson.dumps(
                 {
                     "message": self.message,
                 },
-            ),
+            ).decode(),
             "isBase64Encoded": False,
         }
 
@@ -90,10 +173,12 @@ def service(
     db_client: DynamoDBClient,
     env: EnvParam,
 ) -> Response:
-    response_items = scan_items(
-        client=db_client,
-        db_name=env.CATEGORY_TABLE_NAME,
-        query="Items[].category.S",
+    response_items = list(
+        query_categories(
+            client=db_client,
+            db_name=env.CATEGORY_TABLE_NAME,
+            index_name=env.CATEGORY_INDEX_NAME,
+        ),
     )
     return Response(
         status_code=200,
@@ -101,14 +186,27 @@ def service(
     )
 
 
-@logger.inject_lambda_context(
-    correlation_id_path="requestContext.requestId",
-)
-def lambda_handler(event: dict[str, Any], context: LambdaContext) -> dict[str, Any]:
+def is_warmup_event(event: dict[str, Any]) -> bool:
+    return (
+        event.get("source") == "serverless-plugin-warmup"
+        or event.get("warmer") is True
+    )
+
+
+def lambda_handler(
+    event: dict[str, Any],
+    context: Any,  # noqa: ANN401
+) -> dict[str, Any]:
+    correlation_id_filter.correlation_id = event.get("requestContext", {}).get(
+        "requestId",
+    )
+    if is_warmup_event(event):
+        logger.info("warmup")
+        return {"statusCode": 200, "body": "warm"}
     try:
         return service(
             db_client=dynamodb_client,
-            env=EnvParam.from_env(),
+            env=_ENV if _ENV is not None else EnvParam.from_env(),
         ).data()
     except ServerError:
         logger.error(traceback.format_exc())
@@ -117,7 +215,7 @@ def lambda_handler(event: dict[str, Any], context: LambdaContext) -> dict[str, A
             message="internal server error. Please access again after some time.",
         ).data()
     except ClientError as ce:
-        logger.warning(traceback.format_exc())
+        logger.warning("client error. %s", ce)
         return Response(
             status_code=400,
             message=f"client error. {ce.message}",
@@ -128,3 +226,6 @@ def lambda_handler(event: dict[str, Any], context: LambdaContext) -> dict[str, A
             status_code=500,
             message="internal server error. Please contact the operator.",
         ).data()
+
+
+prime_connection(dynamodb_client, os.environ.get("CATEGORY_TABLE_NAME"))
@@ -1,21 +1,77 @@
 import json
+import logging
 import os
 import random
+import time
 import traceback
 from decimal import Decimal
 from typing import Any, NamedTuple, TypeVar
 
 import boto3
 import botocore
-from aws_lambda_powertools.logging import Logger
-from aws_lambda_powertools.utilities.typing import LambdaContext
-from mypy_boto3_dynamodb import DynamoDBServiceResource
+import orjson
+from boto3.dynamodb.types import TypeDeserializer
+from botocore.config import Config
+from mypy_boto3_dynamodb import DynamoDBClient
 
-logger = Logger()
-dynamodb_resource = boto3.resource("dynamodb")
+JsonFormatterSelf = TypeVar("JsonFormatterSelf", bound="JsonFormatter")
+CorrelationIdFilterSelf = TypeVar(
+    "CorrelationIdFilterSelf",
+    bound="CorrelationIdFilter",
+)
+
+
+class JsonFormatter(logging.Formatter):
+    def format(  # noqa: A003
+        self: JsonFormatterSelf,
+        record: logging.LogRecord,
+    ) -> str:
+        log = {
+            "level": record.levelname,
+            "location": f"{record.funcName}:{record.lineno}",
+            "message": record.getMessage(),
+            "timestamp": self.formatTime(record),
+            "service": os.environ.get("SERVICE_NAME"),
+            "correlation_id": getattr(record, "correlation_id", None),
+        }
+        if record.exc_info:
+            log["exception"] = self.formatException(record.exc_info)
+        return json.dumps(log, default=str)
+
+
+class CorrelationIdFilter(logging.Filter):
+    correlation_id: str | None = None
+
+    def filter(  # noqa: A003
+        self: CorrelationIdFilterSelf,
+        record: logging.LogRecord,
+    ) -> bool:
+        record.correlation_id = self.correlation_id
+        return True
+
+
+logger = logging.getLogger()
+logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
+correlation_id_filter = CorrelationIdFilter()
+for handler in logger.handlers:
+    handler.setFormatter(JsonFormatter())
+    handler.addFilter(correlation_id_filter)
+
+dynamodb_client = boto3.client(
+    "dynamodb",
+    config=Config(
+        tcp_keepalive=True,
+        max_pool_connections=10,
+        retries={"mode": "standard"},
+    ),
+)
+type_deserializer = TypeDeserializer()
+random.seed(int.from_bytes(os.urandom(16), "big"))
 ClientErrorSelf = TypeVar("ClientErrorSelf", bound="ClientError")
 ServerErrorSelf = TypeVar("ServerErrorSelf", bound="ServerError")
 ResponseSelf = TypeVar("ResponseSelf", bound="Response")
+NUM_ITEM_CACHE_TTL_SECONDS = 60
+_NUM_ITEM_CACHE: dict[str, tuple[int, float]] = {}
 
 
 class ClientError(Exception):
@@ -36,7 +92,10 @@ class EnvParam(NamedTuple):
     @classmethod
     def from_env(cls: type["EnvParam"]) -> "EnvParam":
         try:
-            return EnvParam(**{k: os.environ[k] for k in EnvParam._fields})
+            return EnvParam(
+                os.environ["CATEGORY_TABLE_NAME"],
+                os.environ["ITEM_TABLE_NAME"],
+            )
         except Exception as e:
             raise ServerError(
                 json.dumps(os.environ),
@@ -44,6 +103,12 @@ class EnvParam(NamedTuple):
             ) from e
 
 
+try:
+    _ENV: EnvParam | None = EnvParam.from_env()
+except ServerError:
+    _ENV = None
+
+
 class ApiPathParamater(NamedTuple):
     category: str
 
@@ -54,21 +119,21 @@ class ApiPathParamater(NamedTuple):
     ) -> "ApiPathParamater":
         try:
             paramater = event["pathParameters"]
-            return ApiPathParamater(
-                **{k: paramater[k] for k in ApiPathParamater._fields},
-            )
+            return ApiPathParamater(paramater["category"])
         except Exception as e:
             raise ClientError(json.dumps(paramater), "Invalid parameter.") from e
 
 
 def get_item(
-    db_resource: DynamoDBServiceResource,
+    client: DynamoDBClient,
     table_name: str,
     key: dict,
 ) -> dict[str, Any] | None:
-    table = db_resource.Table(table_name)
     try:
-        return table.get_item(Key=key).get("Item")
+        item = client.get_item(TableName=table_name, Key=key).get("Item")
+        if item is None:
+            return None
+        return type_deserializer.deserialize({"M": item})  # type: ignore  # noqa: PGH003, E501
     except botocore.exceptions.ClientError as error:
         if error.response["Error"]["Code"] == "InternalServerError":
             raise ServerError(
@@ -90,6 +155,23 @@ def decimal_default_proc(obj: Any) -> int:  # noqa: ANN401
     raise TypeError
 
 
+def prime_connection(client: DynamoDBClient, table_name: str | None) -> None:
+    if table_name is None:
+        return
+    try:
+        client.describe_table(TableName=table_name)
+    except Exception:
+        logger.warning(traceback.format_exc())
+
+
+def dumps_body(body: dict[str, Any]) -> str:
+    try:
+        return orjson.dumps(body, default=decimal_default_proc).decode()
+    except TypeError:
+        # orjson cannot encode integers beyond 64 bits, json can
+        return json.dumps(body, default=decimal_default_proc)
+
+
 class Response(NamedTuple):
     status_code: int
     message: str | dict
@@ -104,39 +186,83 @@ class Response(NamedTuple):
                 "Access-Control-Allow-Credentials": True,
                 "Access-Control-Allow-Headers": "origin, x-requested-with",
             },
-            "body": json.dumps(
-                {
-                    "message": self.message,
-                },
-                default=decimal_default_proc,
-            ),
+            "body": dumps_body({"message": self.message}),
             "isBase64Encoded": False,
         }
 
 
-def service(
-    body: ApiPathParamater,
-    db_resource: DynamoDBServiceResource,
-    env: EnvParam,
-) -> Response:
+def get_num_item(
+    client: DynamoDBClient,
+    table_name: str,
+    category: str,
+) -> int:
     response_category = get_item(
-        db_resource=db_resource,
-        table_name=env.CATEGORY_TABLE_NAME,
-        key={"category": body.category},
+        client=client,
+        table_name=table_name,
+        key={"category": {"S": category}},
     )
     if response_category is None:
         raise ClientError(
-            input_param=body.category,
-            message=f"category is empty: {body.category}",
+            input_param=category,
+            message=f"category is empty: {category}",
         )
+    num_item = int(response_category["num_item"])
+    _NUM_ITEM_CACHE[category] = (num_item, time.monotonic())
+    return num_item
+
+
+def get_cached_num_item(category: str) -> int | None:
+    cached = _NUM_ITEM_CACHE.get(category)
+    if cached is None:
+        return None
+    num_item, cached_at = cached
+    if time.monotonic() - cached_at > NUM_ITEM_CACHE_TTL_SECONDS:
+        return None
+    return num_item
+
+
+def draw_item(
+    client: DynamoDBClient,
+    table_name: str,
+    category: str,
+    num_item: int,
+) -> tuple[dict, dict[str, Any] | None]:
     key = {
-        "category": body.category,
-        "item_id": random.randint(0, response_category["num_item"] - 1),
+        "category": {"S": category},
+        "item_id": {"N": str(random.randrange(num_item))},
     }
-    response_items = get_item(
-        db_resource=db_resource,
+    return key, get_item(client=client, table_name=table_name, key=key)
+
+
+def service(
+    body: ApiPathParamater,
+    db_client: DynamoDBClient,
+    env: EnvParam,
+) -> Response:
+    num_item = get_cached_num_item(body.category)
+    if num_item is not None:
+        _, response_items = draw_item(
+            client=db_client,
+            table_name=env.ITEM_TABLE_NAME,
+            category=body.category,
+            num_item=num_item,
+        )
+        if response_items is not None:
+            return Response(
+                status_code=200,
+                message=response_items,
+            )
+        _NUM_ITEM_CACHE.pop(body.category, None)
+    num_item = get_num_item(
+        client=db_client,
+        table_name=env.CATEGORY_TABLE_NAME,
+        category=body.category,
+    )
+    key, response_items = draw_item(
+        client=db_client,
         table_name=env.ITEM_TABLE_NAME,
-        key=key,
+        category=body.category,
+        num_item=num_item,
     )
     if response_items is None:
         raise ServerError(
@@ -149,15 +275,28 @@ def service(
     )
 
 
-@logger.inject_lambda_context(
-    correlation_id_path="requestContext.requestId",
-)
-def lambda_handler(event: dict[str, Any], context: LambdaContext) -> dict[str, Any]:
+def is_warmup_event(event: dict[str, Any]) -> bool:
+    return (
+        event.get("source") == "serverless-plugin-warmup"
+        or event.get("warmer") is True
+    )
+
+
+def lambda_handler(
+    event: dict[str, Any],
+    context: Any,  # noqa: ANN401
+) -> dict[str, Any]:
+    correlation_id_filter.correlation_id = event.get("requestContext", {}).get(
+        "requestId",
+    )
+    if is_warmup_event(event):
+        logger.info("warmup")
+        return {"statusCode": 200, "body": "warm"}
     try:
         return service(
             body=ApiPathParamater.from_event(event),
-            db_resource=dynamodb_resource,
-            env=EnvParam.from_env(),
+            db_client=dynamodb_client,
+            env=_ENV if _ENV is not None else EnvParam.from_env(),
         ).data()
     except ServerError:
         logger.error(traceback.format_exc())
@@ -166,7 +305,7 @@ def lambda_handler(event: dict[str, Any], context: LambdaContext) -> dict[str, A
             message="internal server error. Please access again after some time.",
         ).data()
     except ClientError as ce:
-        logger.warning(traceback.format_exc())
+        logger.warning("client error. %s", ce)
         return Response(
             status_code=400,
             message=f"client error. {ce.message}",
@@ -177,3 +316,6 @@ def lambda_handler(event: dict[str, Any], context: LambdaContext) -> dict[str, A
             status_code=500,
             message="internal server error. Please contact the operator.",
         ).data()
+
+
+prime_connection(dynamodb_client, os.environ.get("CATEGORY_TABLE_NAME"))